@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Type
+from typing import Iterable, Type
 
 from common.agent_events import AbstractAgentEvent
 
@@ -54,3 +54,13 @@ class IAgentEventQueue(ABC):
         """
 
         pass
+
+    @abstractmethod
+    def publish_many(self, events: Iterable[AbstractAgentEvent]):
+        """
+        Publishes multiple events, in order
+
+        :param events: Events to publish
+        """
+
+        pass
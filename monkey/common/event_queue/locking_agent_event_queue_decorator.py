@@ -1,4 +1,4 @@
-from typing import Type
+from typing import Iterable, Type
 
 from monkeytypes import BasicLock
 
@@ -9,7 +9,7 @@ from . import AgentEventSubscriber, IAgentEventQueue
 
 class LockingAgentEventQueueDecorator(IAgentEventQueue):
     """
-    Makes an IAgentEventQueue thread-safe by locking publish()
+    Makes an IAgentEventQueue thread-safe by locking publish() and publish_many()
     """
 
     def __init__(self, agent_event_queue: IAgentEventQueue, lock: BasicLock):
@@ -30,3 +30,7 @@ class LockingAgentEventQueueDecorator(IAgentEventQueue):
     def publish(self, event: AbstractAgentEvent):
         with self._lock:
             self._agent_event_queue.publish(event)
+
+    def publish_many(self, events: Iterable[AbstractAgentEvent]):
+        with self._lock:
+            self._agent_event_queue.publish_many(events)
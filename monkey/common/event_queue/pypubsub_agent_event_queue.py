@@ -1,5 +1,5 @@
 import logging
-from typing import Type
+from typing import Iterable, Type
 
 from pubsub.core import Publisher
 
@@ -39,6 +39,10 @@ class PyPubSubAgentEventQueue(IAgentEventQueue):
         self._publish_to_type_topic(event)
         self._publish_to_tags_topics(event)
 
+    def publish_many(self, events: Iterable[AbstractAgentEvent]):
+        for event in events:
+            self.publish(event)
+
     def _publish_to_all_events_topic(self, event: AbstractAgentEvent):
         self._publish_event(_ALL_EVENTS_TOPIC, event)
 
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Sequence, Type, TypeVar
+from typing import Optional, Sequence, Tuple, Type, TypeVar
 
 from common.agent_events import AbstractAgentEvent
 from common.types import AgentID
@@ -48,6 +48,65 @@ class IAgentEventRepository(ABC):
         :raises RetrievalError: If an error occurred while attempting to retrieve the event
         """
 
+    @abstractmethod
+    def get_filtered_events(
+        self,
+        event_type: Optional[Type[AbstractAgentEvent]] = None,
+        tag: Optional[str] = None,
+        success: Optional[bool] = None,
+        timestamp_gt: Optional[float] = None,
+        timestamp_lt: Optional[float] = None,
+    ) -> Sequence[AbstractAgentEvent]:
+        """
+        Retrieve the events that match all of the provided filters
+
+        Filters that are `None` are not applied.
+
+        :param event_type: Type of event
+        :param tag: Tag of event
+        :param success: The value of the event's `success` field. Events without a `success` field
+                        do not match this filter.
+        :param timestamp_gt: Only retrieve events that occurred after this timestamp
+        :param timestamp_lt: Only retrieve events that occurred before this timestamp
+        :return: Stored events that match all of the filters, sorted ascending by timestamp. Events
+                 with the same timestamp are sorted in the order in which they were stored.
+        :raises RetrievalError: If an error occurred while attempting to retrieve the events
+        """
+
+    @abstractmethod
+    def get_filtered_events_page(
+        self,
+        event_type: Optional[Type[AbstractAgentEvent]] = None,
+        tag: Optional[str] = None,
+        success: Optional[bool] = None,
+        timestamp_gt: Optional[float] = None,
+        timestamp_lt: Optional[float] = None,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[Sequence[AbstractAgentEvent], Optional[str]]:
+        """
+        Retrieve a page of the events that match all of the provided filters
+
+        Filters that are `None` are not applied. Pages are sorted the same way as the events
+        returned by `get_filtered_events()`, so passing the cursor of each page as `after` when
+        retrieving the next one retrieves every matching event exactly once.
+
+        :param event_type: Type of event
+        :param tag: Tag of event
+        :param success: The value of the event's `success` field. Events without a `success` field
+                        do not match this filter.
+        :param timestamp_gt: Only retrieve events that occurred after this timestamp
+        :param timestamp_lt: Only retrieve events that occurred before this timestamp
+        :param after: The cursor of a previously retrieved page. Only events that are sorted after
+                      the last event of that page are retrieved.
+        :param limit: The maximum number of events in the page. If `None`, all matching events
+                      are retrieved.
+        :return: The events in the page, and a cursor that points to the last event in the page.
+                 If the page is empty, the cursor is `None`.
+        :raises ValueError: If `after` is not a valid cursor
+        :raises RetrievalError: If an error occurred while attempting to retrieve the events
+        """
+
     @abstractmethod
     def get_events_by_source(self, source: AgentID) -> Sequence[AbstractAgentEvent]:
         """
@@ -58,6 +117,15 @@ class IAgentEventRepository(ABC):
         :raises RetrievalError: If an error occurred while attempting to retrieve the event
         """
 
+    @abstractmethod
+    def get_latest_event(self) -> Optional[AbstractAgentEvent]:
+        """
+        Retrieve the most recent event
+
+        :return: The stored event with the latest timestamp, or None if there are no stored events
+        :raises RetrievalError: If an error occurred while attempting to retrieve the event
+        """
+
     @abstractmethod
     def reset(self):
         """
@@ -1,8 +1,13 @@
 import logging
-from typing import Any, Dict, Sequence, Type
+import math
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, Optional, Sequence, Tuple, Type
 
 import pymongo
+from bson import ObjectId
+from bson.errors import InvalidId
 from pymongo import MongoClient
+from pymongo.cursor import Cursor
 
 from common.agent_event_serializers import (
     EVENT_TYPE_FIELD,
@@ -27,11 +32,14 @@ from monkey_island.cc.repositories.i_agent_event_repository import T
 from monkey_island.cc.server_utils.encryption import ILockableEncryptor
 
 from . import RemovalError, RetrievalError, StorageError
-from .agent_event_encryption import decrypt_event, encrypt_event
+from .agent_event_encryption import ENCRYPTED_PREFIX, decrypt_event, encrypt_event
 from .consts import MONGO_OBJECT_ID_KEY
 
 logger = logging.getLogger(__name__)
 
+TAGS_FIELD = "tags"
+SUCCESS_FIELD = "success"
+
 EVENT_ALLOWLIST = [
     AgentShutdownEvent,
     ExploitationEvent,
@@ -43,6 +51,9 @@ EVENT_ALLOWLIST = [
     PropagationEvent,
     TCPScanEvent,
 ]
+EVENT_ALLOWLIST_NAMES = frozenset(event_type.__name__ for event_type in EVENT_ALLOWLIST)
+
+EVENT_SORT_ORDER = [(TIMESTAMP_FIELD, pymongo.ASCENDING), (MONGO_OBJECT_ID_KEY, pymongo.ASCENDING)]
 
 
 class MongoAgentEventRepository(IAgentEventRepository):
@@ -58,7 +69,14 @@ class MongoAgentEventRepository(IAgentEventRepository):
         self._serializers = serializer_registry
         self._encryptor = encryptor
         self._events_collection.create_index(EVENT_TYPE_FIELD)
-        self._events_collection.create_index(TIMESTAMP_FIELD)
+        # Events are always returned sorted by timestamp, and events with the same timestamp in the
+        # order in which they were stored. These compound indexes allow MongoDB to return filtered
+        # events in order without sorting them in memory.
+        self._events_collection.create_index(EVENT_SORT_ORDER)
+        self._events_collection.create_index(
+            [(EVENT_TYPE_FIELD, pymongo.ASCENDING), *EVENT_SORT_ORDER]
+        )
+        self._events_collection.create_index([(TAGS_FIELD, pymongo.ASCENDING), *EVENT_SORT_ORDER])
 
     def save_event(self, event: AbstractAgentEvent):
         try:
@@ -85,35 +103,166 @@ class MongoAgentEventRepository(IAgentEventRepository):
 
     def get_events_by_tag(self, tag: str) -> Sequence[AbstractAgentEvent]:
         try:
-            return self._query_events({"tags": {"$in": [tag]}})
+            return self._query_events({TAGS_FIELD: {"$in": [tag]}})
         except Exception as err:
             raise RetrievalError(f"Error retrieving events for tag {tag}: {err}")
 
+    def get_filtered_events(
+        self,
+        event_type: Optional[Type[AbstractAgentEvent]] = None,
+        tag: Optional[str] = None,
+        success: Optional[bool] = None,
+        timestamp_gt: Optional[float] = None,
+        timestamp_lt: Optional[float] = None,
+    ) -> Sequence[AbstractAgentEvent]:
+        events, _ = self.get_filtered_events_page(
+            event_type=event_type,
+            tag=tag,
+            success=success,
+            timestamp_gt=timestamp_gt,
+            timestamp_lt=timestamp_lt,
+        )
+        return events
+
+    def get_filtered_events_page(
+        self,
+        event_type: Optional[Type[AbstractAgentEvent]] = None,
+        tag: Optional[str] = None,
+        success: Optional[bool] = None,
+        timestamp_gt: Optional[float] = None,
+        timestamp_lt: Optional[float] = None,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[Sequence[AbstractAgentEvent], Optional[str]]:
+        query = MongoAgentEventRepository._build_filter_query(
+            event_type, tag, success, timestamp_gt, timestamp_lt, after
+        )
+
+        try:
+            serialized_events = self._events_collection.find(query).sort(EVENT_SORT_ORDER)
+            if success is None and limit is not None:
+                serialized_events = serialized_events.limit(limit)
+
+            events = self._deserialize_with_ids(serialized_events)
+            if success is not None:
+                # Encrypted events can only be filtered by success after they are decrypted. The
+                # cursor is consumed lazily so that no more events than needed are decrypted.
+                events = (e for e in events if getattr(e[1], SUCCESS_FIELD, None) is success)
+            page = list(islice(events, limit))
+        except Exception as err:
+            raise RetrievalError(f"Error retrieving filtered events: {err}")
+
+        if not page:
+            return [], None
+
+        last_event_id, last_event = page[-1]
+        return [event for _, event in page], f"{last_event.timestamp!r}:{last_event_id}"
+
     def get_events_by_source(self, source: AgentID) -> Sequence[AbstractAgentEvent]:
         try:
             return self._query_events({"source": str(source)})
         except Exception as err:
             raise RetrievalError(f"Error retrieving events for source {source}: {err}")
 
+    def get_latest_event(self) -> Optional[AbstractAgentEvent]:
+        try:
+            serialized_events = (
+                self._events_collection.find({}, {MONGO_OBJECT_ID_KEY: False})
+                .sort(TIMESTAMP_FIELD, pymongo.DESCENDING)
+                .limit(1)
+            )
+            return next(map(self._deserialize, serialized_events), None)
+        except Exception as err:
+            raise RetrievalError(f"Error retrieving the latest event: {err}")
+
     def reset(self):
         try:
             self._events_collection.drop()
         except Exception as err:
             raise RemovalError(f"Error resetting the repository: {err}")
 
+    @staticmethod
+    def _build_filter_query(
+        event_type: Optional[Type[AbstractAgentEvent]],
+        tag: Optional[str],
+        success: Optional[bool],
+        timestamp_gt: Optional[float],
+        timestamp_lt: Optional[float],
+        after: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        query: Dict[str, Any] = {}
+        if event_type is not None:
+            query[EVENT_TYPE_FIELD] = event_type.__name__
+        if tag is not None:
+            query[TAGS_FIELD] = {"$in": [tag]}
+
+        timestamp_query = {}
+        if timestamp_gt is not None:
+            timestamp_query["$gt"] = timestamp_gt
+        if timestamp_lt is not None:
+            timestamp_query["$lt"] = timestamp_lt
+        if timestamp_query:
+            query[TIMESTAMP_FIELD] = timestamp_query
+
+        if success is not None:
+            # Fields that are specific to an event type, like "success", are encrypted in the
+            # database unless the event type is on the allowlist. Unencrypted events are filtered by
+            # the query, so only encrypted events that may match need to be retrieved and decrypted.
+            query["$or"] = [
+                {SUCCESS_FIELD: success},
+                {ENCRYPTED_PREFIX + SUCCESS_FIELD: {"$exists": True}},
+            ]
+
+        if after is not None:
+            # Events are sorted by timestamp and then by _id, so the events after the cursor are
+            # the ones with a later timestamp, or the same timestamp and a later _id. "$and" keeps
+            # this from replacing the "$or" of the success filter.
+            after_timestamp, after_id = MongoAgentEventRepository._parse_cursor(after)
+            query["$and"] = [
+                {
+                    "$or": [
+                        {TIMESTAMP_FIELD: {"$gt": after_timestamp}},
+                        {TIMESTAMP_FIELD: after_timestamp, MONGO_OBJECT_ID_KEY: {"$gt": after_id}},
+                    ]
+                }
+            ]
+
+        return query
+
+    @staticmethod
+    def _parse_cursor(cursor: str) -> Tuple[float, ObjectId]:
+        try:
+            timestamp, object_id = cursor.split(":")
+            cursor_timestamp = float(timestamp)
+            cursor_id = ObjectId(object_id)
+        except (ValueError, InvalidId):
+            raise ValueError(f'Invalid cursor "{cursor}"')
+
+        if not math.isfinite(cursor_timestamp):
+            raise ValueError(f'Invalid cursor "{cursor}"')
+
+        return cursor_timestamp, cursor_id
+
     def _deserialize(self, mongo_record: Dict[str, Any]) -> AbstractAgentEvent:
         event_type = mongo_record[EVENT_TYPE_FIELD]
         serializer = self._serializers[event_type]
 
-        if event_type not in [
-            event_allowlist_type.__name__ for event_allowlist_type in EVENT_ALLOWLIST
-        ]:
+        if event_type not in EVENT_ALLOWLIST_NAMES:
             mongo_record = decrypt_event(self._encryptor.decrypt, mongo_record)  # type: ignore[assignment]  # noqa: E501
 
         return serializer.deserialize(mongo_record)
 
+    def _deserialize_with_ids(
+        self, mongo_records: Iterable[Dict[str, Any]]
+    ) -> Iterator[Tuple[ObjectId, AbstractAgentEvent]]:
+        for mongo_record in mongo_records:
+            object_id = mongo_record.pop(MONGO_OBJECT_ID_KEY)
+            yield object_id, self._deserialize(mongo_record)
+
     def _query_events(self, query: Dict[Any, Any]) -> Sequence[AbstractAgentEvent]:
-        serialized_events = self._events_collection.find(query, {MONGO_OBJECT_ID_KEY: False}).sort(
-            TIMESTAMP_FIELD, pymongo.ASCENDING
+        return list(map(self._deserialize, self._find_events(query)))
+
+    def _find_events(self, query: Dict[Any, Any]) -> Cursor:
+        return self._events_collection.find(query, {MONGO_OBJECT_ID_KEY: False}).sort(
+            EVENT_SORT_ORDER
         )
-        return list(map(self._deserialize, serialized_events))
@@ -1,10 +1,12 @@
+import json
 import logging
+import math
 import re
-from bisect import bisect_left, bisect_right
 from http import HTTPStatus
-from typing import Iterable, Optional, Sequence, Tuple, Type
+from itertools import chain, islice
+from typing import Callable, Dict, Iterable, Iterator, Optional, Sequence, Tuple, Type
 
-from flask import request
+from flask import Response, request
 from flask_security import auth_token_required, roles_accepted
 
 from common.agent_event_serializers import EVENT_TYPE_FIELD, AgentEventSerializerRegistry
@@ -17,6 +19,17 @@ from monkey_island.cc.services.authentication_service import AccountRole
 
 logger = logging.getLogger(__name__)
 
+_EVENT_TAG_PATTERN = re.compile(EVENT_TAG_REGEX)
+_SUCCESS_ARG_VALUES = {None: None, "true": True, "false": False}
+_TIMESTAMP_ARG_PATTERN = re.compile(
+    r"(?P<operator>gt|lt):(?P<timestamp>[-+]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?)"
+)
+EVENT_STREAM_CHUNK_SIZE = 100
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_EVENTS_LIMIT = 10_000
+
+SerializeFns = Dict[Type[AbstractAgentEvent], Callable[[AbstractAgentEvent], JSONSerializable]]
+
 
 class AgentEvents(AbstractResource):
     urls = ["/api/agent-events"]
@@ -36,22 +49,31 @@ class AgentEvents(AbstractResource):
     @auth_token_required
     @roles_accepted(AccountRole.AGENT.name)
     def post(self):
-        serialized_events = request.json
+        # The parsed events are only needed here, so don't keep the raw body and the parsed JSON
+        # cached on the request for the rest of its lifetime
+        serialized_events = request.get_json(cache=False)
         deserialized_events = []
+        # Batches usually contain only a few event types, so only look up the deserializer for each
+        # type in the registry once
+        deserialize_fns: Dict[str, Callable[[JSONSerializable], AbstractAgentEvent]] = {}
 
         logger.debug(f"Deserializing {len(serialized_events)} events")
         for event in serialized_events:
             try:
-                serializer = self._event_serializer_registry[event[EVENT_TYPE_FIELD]]
-                deserialized_events.append(serializer.deserialize(event))
+                event_type = event[EVENT_TYPE_FIELD]
+                deserialize = deserialize_fns.get(event_type)
+                if deserialize is None:
+                    deserialize = self._event_serializer_registry[event_type].deserialize
+                    deserialize_fns[event_type] = deserialize
+
+                deserialized_events.append(deserialize(event))
             except (TypeError, ValueError) as err:
                 logger.exception(f"Error occurred while deserializing an event {event}: {err}")
                 return {"error": str(err)}, HTTPStatus.BAD_REQUEST
         logger.debug(f"Completed deserialization of {len(serialized_events)} events")
 
         logger.debug(f"Publishing {len(deserialized_events)} events to the queue")
-        for deserialized_event in deserialized_events:
-            self._agent_event_queue.publish(deserialized_event)
+        self._agent_event_queue.publish_many(deserialized_events)
         logger.debug(f"Completed publishing {len(deserialized_events)} events to the queue")
 
         return {}, HTTPStatus.NO_CONTENT
@@ -60,18 +82,39 @@ class AgentEvents(AbstractResource):
     @roles_accepted(AccountRole.ISLAND_INTERFACE.name)
     def get(self):
         try:
-            type_, tag, success, timestamp_constraint = self._parse_event_filter_args()
-        except Exception as err:
+            (
+                type_,
+                tag,
+                success,
+                timestamp_constraint,
+                after,
+                limit,
+            ) = self._parse_event_filter_args()
+            events, next_cursor = self._get_filtered_events(
+                type_, tag, success, timestamp_constraint, after, limit
+            )
+        except ValueError as err:
             return {"error": str(err)}, HTTPStatus.UNPROCESSABLE_ENTITY
 
-        events = self._get_filtered_events(type_, tag, success, timestamp_constraint)
-
+        serialized_event_chunks = self._stream_serialized_events(events)
         try:
-            serialized_events = self._serialize_events(events)
-        except (TypeError, ValueError) as err:
+            # The first chunk is serialized before the response is returned so that a failure to
+            # serialize it still results in an error response. A failure in a later chunk can only
+            # truncate the response, as its status has already been sent by then.
+            first_chunk = next(serialized_event_chunks)
+        except (KeyError, TypeError, ValueError) as err:
             return {"error": str(err)}, HTTPStatus.INTERNAL_SERVER_ERROR
 
-        return serialized_events, HTTPStatus.OK
+        response = Response(
+            chain((first_chunk,), serialized_event_chunks),
+            status=HTTPStatus.OK,
+            mimetype="application/json",
+        )
+        # The response body is a list of events, so the cursor of the page is sent in a header
+        if next_cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+        return response
 
     def _parse_event_filter_args(
         self,
@@ -80,18 +123,27 @@ class AgentEvents(AbstractResource):
         Optional[str],
         Optional[bool],
         Optional[Tuple[str, float]],
+        Optional[str],
+        Optional[int],
     ]:
+        if not request.args:
+            return None, None, None, None, None, None
+
         type_arg = request.args.get("type", None)
         tag_arg = request.args.get("tag", None)
         success_arg = request.args.get("success", None)
         timestamp_arg = request.args.get("timestamp", None)
+        # The cursor is opaque to the resource. The repository validates it.
+        after = request.args.get("after", None)
+        limit_arg = request.args.get("limit", None)
 
         type_ = self._parse_type_arg(type_arg)
         tag = self._parse_tag_arg(tag_arg)
         success = self._parse_success_arg(success_arg)
         timestamp_constraint = self._parse_timestamp_arg(timestamp_arg)
+        limit = self._parse_limit_arg(limit_arg)
 
-        return type_, tag, success, timestamp_constraint
+        return type_, tag, success, timestamp_constraint, after, limit
 
     def _parse_type_arg(self, type_arg: Optional[str]) -> Optional[Type[AbstractAgentEvent]]:
         try:
@@ -102,44 +154,45 @@ class AgentEvents(AbstractResource):
         return type_
 
     def _parse_tag_arg(self, tag_arg: Optional[str]) -> Optional[str]:
-        if tag_arg and not re.match(pattern=re.compile(EVENT_TAG_REGEX), string=tag_arg):
+        if tag_arg and not _EVENT_TAG_PATTERN.match(tag_arg):
             raise ValueError(f'Invalid event tag "{tag_arg}"')
 
         return tag_arg
 
     def _parse_success_arg(self, success_arg: Optional[str]) -> Optional[bool]:
-        if success_arg is None:
-            success = None
-        elif success_arg == "true":
-            success = True
-        elif success_arg == "false":
-            success = False
-        else:
+        try:
+            return _SUCCESS_ARG_VALUES[success_arg]
+        except KeyError:
             raise ValueError(
                 f'Invalid value for success "{success_arg}", expected "true" or "false"'
             )
 
-        return success
-
     def _parse_timestamp_arg(self, timestamp_arg: Optional[str]) -> Optional[Tuple[str, float]]:
         if timestamp_arg is None:
-            timestamp_constraint = None
+            return None
+
+        match = _TIMESTAMP_ARG_PATTERN.fullmatch(timestamp_arg)
+        # Exponents that are too large, like "1e999", overflow to infinity
+        if match is None or not math.isfinite(timestamp := float(match.group("timestamp"))):
+            raise ValueError(
+                f'Invalid timestamp argument "{timestamp_arg}", '
+                'expected format: "{gt,lt}:<timestamp>" where <timestamp> is a finite number'
+            )
+
+        return match.group("operator"), timestamp
+
+    def _parse_limit_arg(self, limit_arg: Optional[str]) -> Optional[int]:
+        if limit_arg is None:
+            limit = None
+        elif limit_arg.isdecimal() and 0 < int(limit_arg) <= MAX_EVENTS_LIMIT:
+            limit = int(limit_arg)
         else:
-            operator, timestamp = timestamp_arg.split(":")
-            if not operator or not timestamp or operator not in ("gt", "lt"):
-                raise ValueError(
-                    f'Invalid timestamp argument "{timestamp_arg}", '
-                    'expected format: "{gt,lt}:<timestamp>"'
-                )
-            try:
-                timestamp_constraint = (operator, float(timestamp))
-            except Exception:
-                raise ValueError(
-                    f'Invalid timestamp argument "{timestamp_arg}", '
-                    "expected timestamp to be a number"
-                )
+            raise ValueError(
+                f'Invalid value for limit "{limit_arg}", '
+                f"expected an integer between 1 and {MAX_EVENTS_LIMIT}"
+            )
 
-        return timestamp_constraint
+        return limit
 
     def _get_filtered_events(
         self,
@@ -147,61 +200,59 @@ class AgentEvents(AbstractResource):
         tag: Optional[str],
         success: Optional[bool],
         timestamp_constraint: Optional[Tuple[str, float]],
-    ) -> Sequence[AbstractAgentEvent]:
-        if type_ is not None and tag is not None:
-            events = self._get_events_filtered_by_type_and_tag(type_, tag)
-        elif type_ is not None and tag is None:
-            events = self._agent_event_repository.get_events_by_type(type_)
-        elif type_ is None and tag is not None:
-            events = self._agent_event_repository.get_events_by_tag(tag)
-        else:
-            events = self._agent_event_repository.get_events()
-
-        if success is not None:
-            events = self._filter_events_by_success(events, success)
-
+        after: Optional[str],
+        limit: Optional[int],
+    ) -> Tuple[Sequence[AbstractAgentEvent], Optional[str]]:
+        timestamp_gt = None
+        timestamp_lt = None
         if timestamp_constraint is not None:
-            events = self._filter_events_by_timestamp(events, timestamp_constraint)
-
-        return events
-
-    def _get_events_filtered_by_type_and_tag(
-        self, type_: Type[AbstractAgentEvent], tag: str
-    ) -> Sequence[AbstractAgentEvent]:
-        events_by_type = set(self._agent_event_repository.get_events_by_type(type_))
-        events_by_tag = set(self._agent_event_repository.get_events_by_tag(tag))
-
-        intersection = events_by_type.intersection(events_by_tag)
-        return sorted(intersection, key=lambda x: x.timestamp)
-
-    def _filter_events_by_success(
-        self, events: Sequence[AbstractAgentEvent], success: bool
-    ) -> Sequence[AbstractAgentEvent]:
-        return list(filter(lambda e: hasattr(e, "success") and e.success is success, events))
-
-    def _filter_events_by_timestamp(
-        self, events: Sequence[AbstractAgentEvent], timestamp_constraint: Tuple[str, float]
-    ) -> Sequence[AbstractAgentEvent]:
-        operator, timestamp = timestamp_constraint
-
-        bisect_fn = bisect_left if operator == "lt" else bisect_right
-        separation_point = bisect_fn(events, timestamp, key=lambda event: event.timestamp)
-
-        if operator == "lt":
-            return events[:separation_point]
-
-        return events[separation_point:]
+            operator, timestamp = timestamp_constraint
+            if operator == "gt":
+                timestamp_gt = timestamp
+            else:
+                timestamp_lt = timestamp
+
+        return self._agent_event_repository.get_filtered_events_page(
+            event_type=type_,
+            tag=tag,
+            success=success,
+            timestamp_gt=timestamp_gt,
+            timestamp_lt=timestamp_lt,
+            after=after,
+            limit=limit,
+        )
+
+    def _stream_serialized_events(self, events: Iterable[AbstractAgentEvent]) -> Iterator[str]:
+        # Events are serialized in chunks so that the response body never has to be held in memory
+        # in its entirety, without writing to the socket once per event. Results usually contain
+        # only a few event types, so only look up the serializer for each type in the registry once.
+        serialize_fns: SerializeFns = {}
+
+        chunk_prefix = "["
+        event_iterator = iter(events)
+        while chunk := list(islice(event_iterator, EVENT_STREAM_CHUNK_SIZE)):
+            yield chunk_prefix + ",".join(
+                json.dumps(self._serialize_event(event, serialize_fns), separators=(",", ":"))
+                for event in chunk
+            )
+            chunk_prefix = ","
 
-    def _serialize_events(self, events: Iterable[AbstractAgentEvent]) -> JSONSerializable:
-        serialized_events = []
+        # The opening bracket is sent with the first chunk, so it hasn't been sent if there were no
+        # events
+        yield "[]" if chunk_prefix == "[" else "]"
 
-        for event in events:
-            try:
-                serializer = self._event_serializer_registry[event.__class__]
-                serialized_event = serializer.serialize(event)
-                serialized_events.append(serialized_event)
-            except (TypeError, ValueError) as err:
-                logger.exception(f"Error occurred while serializing an event {event}: {err}")
-                raise err
-
-        return serialized_events
+    def _serialize_event(
+        self,
+        event: AbstractAgentEvent,
+        serialize_fns: SerializeFns,
+    ) -> JSONSerializable:
+        try:
+            serialize = serialize_fns.get(event.__class__)
+            if serialize is None:
+                serialize = self._event_serializer_registry[event.__class__].serialize
+                serialize_fns[event.__class__] = serialize
+
+            return serialize(event)
+        except (KeyError, TypeError, ValueError) as err:
+            logger.exception(f"Error occurred while serializing an event {event}: {err}")
+            raise err
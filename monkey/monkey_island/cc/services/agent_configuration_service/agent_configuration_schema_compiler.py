@@ -1,7 +1,8 @@
 from copy import deepcopy
+from functools import reduce
+from operator import getitem
 from typing import Any, Dict
 
-import dpath
 from monkeytypes import AgentPluginManifest, AgentPluginType
 
 from common.agent_configuration import AgentConfiguration
@@ -57,7 +58,7 @@ class AgentConfigurationSchemaCompiler:
 
     def _add_properties_field_to_plugin_types(self, schema: Dict[str, Any]) -> Dict[str, Any]:
         for plugin_path in PLUGIN_PATH_IN_SCHEMA.values():
-            plugin_schema = dpath.get(schema, plugin_path, ".")
+            plugin_schema = _get_schema_node(schema, plugin_path)
             plugin_schema["properties"] = {}
             plugin_schema["additionalProperties"] = False
         return schema
@@ -70,8 +71,8 @@ class AgentConfigurationSchemaCompiler:
         return schema
 
     def _add_non_plugin_fingerprinters(self, schema: Dict[str, Any]) -> Dict[str, Any]:
-        properties = dpath.get(
-            schema, PLUGIN_PATH_IN_SCHEMA[AgentPluginType.FINGERPRINTER] + ".properties", "."
+        properties = _get_schema_node(
+            schema, PLUGIN_PATH_IN_SCHEMA[AgentPluginType.FINGERPRINTER] + ".properties"
         )
         fingerprinter_schemas = self._add_manifests_to_plugins_schema(
             HARD_CODED_FINGERPRINTER_SCHEMAS, HARD_CODED_FINGERPRINTER_MANIFESTS
@@ -86,6 +87,11 @@ class AgentConfigurationSchemaCompiler:
         plugin_name: str,
         config_schema: Dict[str, Any],
     ):
-        properties = dpath.get(schema, PLUGIN_PATH_IN_SCHEMA[plugin_type] + ".properties", ".")
+        properties = _get_schema_node(schema, PLUGIN_PATH_IN_SCHEMA[plugin_type] + ".properties")
         properties.update({plugin_name: config_schema})
         return schema
+
+
+# Resolves a dot-separated path, e.g. "definitions.ExploitationConfiguration", to a schema node
+def _get_schema_node(schema: Dict[str, Any], path: str) -> Dict[str, Any]:
+    return reduce(getitem, path.split("."), schema)
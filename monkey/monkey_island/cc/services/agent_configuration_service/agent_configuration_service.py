@@ -1,3 +1,8 @@
+import json
+from hashlib import sha256
+from typing import Any, Dict, Optional, Tuple
+from uuid import uuid4
+
 from common.agent_configuration import AgentConfiguration
 
 from . import IAgentConfigurationService
@@ -17,15 +22,49 @@ class AgentConfigurationService(IAgentConfigurationService):
     ):
         self._repository = agent_configuration_repository
         self._schema_compiler = schema_compiler
+        self._configuration_version = uuid4().hex
+        self._cached_configuration: Optional[Tuple[str, AgentConfiguration]] = None
 
     def get_schema(self):
         return self._schema_compiler.get_schema()
 
     def get_configuration(self) -> AgentConfiguration:
-        return self._repository.get_configuration()
+        return self.get_versioned_configuration()[1]
+
+    def get_versioned_configuration(self) -> Tuple[str, AgentConfiguration]:
+        # The version must be computed before the configuration is read so that a concurrent update
+        # can't cause an outdated configuration to be tagged with the new version
+        configuration_version = self._get_configuration_version()
+
+        # Reading the configuration from the repository means reading, decrypting, and validating
+        # it against the schema. The configuration can't change without its version changing, so
+        # only do this once per version.
+        cached_configuration = self._cached_configuration
+        if cached_configuration is None or cached_configuration[0] != configuration_version:
+            configuration = self._repository.get_configuration()
+            cached_configuration = (configuration_version, configuration)
+            self._cached_configuration = cached_configuration
+
+        # AgentConfiguration is mutable, so callers must not share the cached instance
+        return configuration_version, cached_configuration[1].copy(deep=True)
 
+    def _get_configuration_version(self) -> str:
+        # Whether the configuration is valid depends on the installed plugins, so installing,
+        # upgrading, or uninstalling a plugin must also change the version
+        schema_hash = _hash_schema(self._schema_compiler.get_schema())
+        return f"{self._configuration_version}-{schema_hash}"
+
+    # The version is changed after the configuration is stored. A reader that gets the version
+    # before the configuration may pair an old version with a new configuration, but never a new
+    # version with an old configuration.
     def update_configuration(self, agent_configuration: AgentConfiguration):
-        return self._repository.update_configuration(agent_configuration)
+        self._repository.update_configuration(agent_configuration)
+        self._configuration_version = uuid4().hex
 
     def reset_to_default(self):
-        return self._repository.reset_to_default()
+        self._repository.reset_to_default()
+        self._configuration_version = uuid4().hex
+
+
+def _hash_schema(schema: Dict[str, Any]) -> str:
+    return sha256(json.dumps(schema, sort_keys=True).encode()).hexdigest()
@@ -1,7 +1,7 @@
 import json
 from http import HTTPStatus
 
-from flask import make_response, request
+from flask import Response, make_response, request
 from flask_security import auth_token_required, roles_accepted
 
 from common.agent_configuration.agent_configuration import (
@@ -22,9 +22,19 @@ class AgentConfiguration(AbstractResource):
     @auth_token_required
     @roles_accepted(AccountRole.AGENT.name, AccountRole.ISLAND_INTERFACE.name)
     def get(self):
-        configuration = self._agent_configuration_service.get_configuration()
-        configuration_dict = configuration.dict(simplify=True)
-        return make_response(configuration_dict, HTTPStatus.OK)
+        versioned_configuration = self._agent_configuration_service.get_versioned_configuration()
+        configuration_version, configuration = versioned_configuration
+        if request.if_none_match.contains(configuration_version):
+            response = Response(status=HTTPStatus.NOT_MODIFIED)
+        else:
+            # `dict(simplify=True)` serializes the configuration to JSON and parses it back, only
+            # for Flask to serialize it again. Serializing it directly avoids the two extra passes.
+            response = Response(
+                configuration.json(), status=HTTPStatus.OK, mimetype="application/json"
+            )
+
+        response.set_etag(configuration_version)
+        return response
 
     @auth_token_required
     @roles_accepted(AccountRole.ISLAND_INTERFACE.name)
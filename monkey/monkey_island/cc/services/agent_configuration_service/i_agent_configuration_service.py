@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Tuple
 
 from common.agent_configuration import AgentConfiguration
 
@@ -29,6 +30,20 @@ class IAgentConfigurationService(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_versioned_configuration(self) -> Tuple[str, AgentConfiguration]:
+        """
+        Retrieve the agent configuration along with an identifier for its version
+
+        The identifier is opaque. It changes whenever the configuration is updated or reset, and
+        whenever an agent plugin is installed, upgraded, or uninstalled.
+
+        :return: The version of the currently stored agent configuration and the configuration
+                 itself
+        :raises RetrievalError: If the configuration could not be retrieved
+        """
+        pass
+
     @abstractmethod
     def update_configuration(self, agent_configuration: AgentConfiguration):
         """
@@ -1,5 +1,6 @@
 import logging
 from datetime import datetime
+from operator import attrgetter
 from typing import Optional
 
 from common.agent_signals import AgentSignals
@@ -49,7 +50,7 @@ class AgentSignalsService:
     def _agent_is_first_to_register(self, agent: Agent) -> bool:
         agents_on_same_machine = self._agents_running_on_machine(agent.machine_id)
         first_to_register = min(
-            agents_on_same_machine, key=lambda a: a.registration_time, default=agent
+            agents_on_same_machine, key=attrgetter("registration_time"), default=agent
         )
         return agent.id == first_to_register.id
 
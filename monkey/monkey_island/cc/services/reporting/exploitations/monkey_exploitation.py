@@ -1,7 +1,7 @@
 import logging
 from copy import deepcopy
 from dataclasses import dataclass
-from typing import Dict, List, Sequence
+from typing import Dict, List, Sequence, cast
 
 from monkeytypes import AgentPluginManifest, AgentPluginType
 
@@ -27,8 +27,10 @@ def get_monkey_exploited(
     machine_repository: IMachineRepository,
     agent_plugin_service: IAgentPluginService,
 ) -> List[MonkeyExploitation]:
-    exploits = event_repository.get_events_by_type(ExploitationEvent)
-    successful_exploits = [e for e in exploits if e.success]
+    successful_exploits = cast(
+        Sequence[ExploitationEvent],
+        event_repository.get_filtered_events(event_type=ExploitationEvent, success=True),
+    )
     plugin_manifests = agent_plugin_service.get_all_plugin_manifests()
 
     exploited_machines = {
@@ -9,8 +9,21 @@ from datetime import datetime
 from enum import Enum
 from ipaddress import IPv4Address
 from itertools import chain, product
+from operator import attrgetter
 from threading import Lock
-from typing import Any, DefaultDict, Dict, Iterable, List, Optional, Sequence, Set, Type, Union
+from typing import (
+    Any,
+    DefaultDict,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Type,
+    Union,
+    cast,
+)
 
 from monkeytypes import AgentPluginManifest, AgentPluginType
 
@@ -94,7 +107,7 @@ class ReportService:
     def get_first_monkey_time(cls):
         agents = cls._agent_repository.get_agents()
 
-        return min(agents, key=lambda a: a.start_time).start_time
+        return min(map(attrgetter("start_time"), agents))
 
     @classmethod
     def get_last_monkey_dead_time(cls) -> Optional[datetime]:
@@ -110,7 +123,7 @@ class ReportService:
         if not all_agents_dead:
             return None
 
-        return max(agents, key=lambda a: a.stop_time).stop_time
+        return max(map(attrgetter("stop_time"), agents))
 
     @staticmethod
     def get_monkey_duration() -> Optional[str]:
@@ -213,8 +226,12 @@ class ReportService:
             raise RuntimeError("Agent event repository does not exist")
 
         # Get the successful exploits
-        exploits = cls._agent_event_repository.get_events_by_type(ExploitationEvent)
-        successful_exploits = filter(lambda x: x.success, exploits)
+        successful_exploits = cast(
+            Sequence[ExploitationEvent],
+            cls._agent_event_repository.get_filtered_events(
+                event_type=ExploitationEvent, success=True
+            ),
+        )
         filtered_exploits = cls.filter_single_exploit_per_ip(successful_exploits)
 
         zerologon_events = cls._agent_event_repository.get_events_by_type(PasswordRestorationEvent)
@@ -515,13 +532,9 @@ class ReportService:
         if not cls._agent_event_repository:
             raise RuntimeError("Agent event repository does not exist")
 
-        # TODO: Add `get_latest_event` to the IAgentEventRepository
-        agent_events = cls._agent_event_repository.get_events()
-        latest_timestamp = (
-            max(agent_events, key=lambda event: event.timestamp).timestamp if agent_events else None
-        )
+        latest_event = cls._agent_event_repository.get_latest_event()
 
-        return latest_timestamp
+        return latest_event.timestamp if latest_event is not None else None
 
     @classmethod
     def _get_exploiter_manifests(cls) -> Dict[str, AgentPluginManifest]:
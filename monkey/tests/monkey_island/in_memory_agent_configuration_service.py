@@ -1,3 +1,5 @@
+from typing import Tuple
+
 from common.agent_configuration import AgentConfiguration
 from monkey_island.cc.services import IAgentConfigurationService
 
@@ -7,6 +9,7 @@ from . import InMemoryAgentConfigurationRepository
 class InMemoryAgentConfigurationService(IAgentConfigurationService):
     def __init__(self):
         self._repository = InMemoryAgentConfigurationRepository()
+        self._configuration_version = 0
 
     def get_schema(self):
         raise NotImplementedError()
@@ -14,8 +17,13 @@ class InMemoryAgentConfigurationService(IAgentConfigurationService):
     def get_configuration(self) -> AgentConfiguration:
         return self._repository.get_configuration()
 
+    def get_versioned_configuration(self) -> Tuple[str, AgentConfiguration]:
+        return str(self._configuration_version), self._repository.get_configuration()
+
     def update_configuration(self, agent_configuration: AgentConfiguration):
-        return self._repository.update_configuration(agent_configuration)
+        self._repository.update_configuration(agent_configuration)
+        self._configuration_version += 1
 
     def reset_to_default(self):
-        return self._repository.reset_to_default()
+        self._repository.reset_to_default()
+        self._configuration_version += 1
@@ -1,4 +1,6 @@
-from typing import Sequence, Type, TypeVar
+from bisect import bisect_right
+from operator import attrgetter
+from typing import List, Optional, Sequence, Tuple, Type, TypeVar
 
 from common.agent_events import AbstractAgentEvent
 from common.types import AgentID
@@ -9,10 +11,16 @@ T = TypeVar("T", bound=AbstractAgentEvent)
 
 class InMemoryAgentEventRepository(IAgentEventRepository):
     def __init__(self):
-        self._events = []
+        self._events: List[AbstractAgentEvent] = []
+        # Event IDs increase in the order in which events are saved, like MongoDB's ObjectIds
+        self._event_ids: List[int] = []
+        self._next_event_id = 0
 
     def save_event(self, event: AbstractAgentEvent):
-        self._events.append(event)
+        index = bisect_right(self._events, event.timestamp, key=attrgetter("timestamp"))
+        self._events.insert(index, event)
+        self._event_ids.insert(index, self._next_event_id)
+        self._next_event_id += 1
 
     def get_events(self) -> Sequence[AbstractAgentEvent]:
         return self._events
@@ -28,8 +36,71 @@ class InMemoryAgentEventRepository(IAgentEventRepository):
     def get_events_by_tag(self, tag: str) -> Sequence[AbstractAgentEvent]:
         pass
 
+    def get_filtered_events(
+        self,
+        event_type: Optional[Type[AbstractAgentEvent]] = None,
+        tag: Optional[str] = None,
+        success: Optional[bool] = None,
+        timestamp_gt: Optional[float] = None,
+        timestamp_lt: Optional[float] = None,
+    ) -> Sequence[AbstractAgentEvent]:
+        events, _ = self.get_filtered_events_page(
+            event_type=event_type,
+            tag=tag,
+            success=success,
+            timestamp_gt=timestamp_gt,
+            timestamp_lt=timestamp_lt,
+        )
+        return events
+
+    def get_filtered_events_page(
+        self,
+        event_type: Optional[Type[AbstractAgentEvent]] = None,
+        tag: Optional[str] = None,
+        success: Optional[bool] = None,
+        timestamp_gt: Optional[float] = None,
+        timestamp_lt: Optional[float] = None,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> Tuple[Sequence[AbstractAgentEvent], Optional[str]]:
+        after_key = None if after is None else _parse_cursor(after)
+
+        page: List[Tuple[int, AbstractAgentEvent]] = []
+        for event_id, event in zip(self._event_ids, self._events):
+            if limit is not None and len(page) >= limit:
+                break
+            if after_key is not None and (event.timestamp, event_id) <= after_key:
+                continue
+            if event_type is not None and not isinstance(event, event_type):
+                continue
+            if tag is not None and tag not in event.tags:
+                continue
+            if success is not None and getattr(event, "success", None) is not success:
+                continue
+            if timestamp_gt is not None and event.timestamp <= timestamp_gt:
+                continue
+            if timestamp_lt is not None and event.timestamp >= timestamp_lt:
+                continue
+
+            page.append((event_id, event))
+
+        if not page:
+            return [], None
+
+        last_event_id, last_event = page[-1]
+        return [event for _, event in page], f"{last_event.timestamp!r}:{last_event_id}"
+
     def get_events_by_source(self, source: AgentID) -> Sequence[AbstractAgentEvent]:
         pass
 
+    def get_latest_event(self) -> Optional[AbstractAgentEvent]:
+        return self._events[-1] if self._events else None
+
     def reset(self):
         self._events = []
+        self._event_ids = []
+
+
+def _parse_cursor(cursor: str) -> Tuple[float, int]:
+    timestamp, event_id = cursor.split(":")
+    return float(timestamp), int(event_id)
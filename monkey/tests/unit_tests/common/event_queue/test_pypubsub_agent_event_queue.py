@@ -100,6 +100,20 @@ def test_subscribe_tags_multiple_types(
     assert {EVENT_TAG_1, EVENT_TAG_2}.issubset(event_queue_subscriber.call_tags)
 
 
+def test_publish_many(event_queue: IAgentEventQueue):
+    published_events = []
+
+    def subscriber(event: AbstractAgentEvent):
+        published_events.append(event)
+
+    event_queue.subscribe_all_events(subscriber)
+    events = [FakeEvent1(timestamp=1.0), FakeEvent2(timestamp=2.0), FakeEvent1(timestamp=3.0)]
+
+    event_queue.publish_many(events)
+
+    assert published_events == events
+
+
 def test_type_tag_collision(
     event_queue: IAgentEventQueue, event_queue_subscriber: AgentEventSubscriber
 ):
@@ -1,5 +1,6 @@
 import datetime
 import uuid
+from ipaddress import IPv4Address
 from typing import Any, Iterable, List, Mapping
 from unittest.mock import MagicMock
 
@@ -13,7 +14,7 @@ from common.agent_event_serializers import (
     AgentEventSerializerRegistry,
     PydanticAgentEventSerializer,
 )
-from common.agent_events import AbstractAgentEvent
+from common.agent_events import AbstractAgentEvent, PasswordRestorationEvent
 from monkey_island.cc.repositories import (
     IAgentEventRepository,
     MongoAgentEventRepository,
@@ -44,11 +45,32 @@ EVENTS: List[AbstractAgentEvent] = [
 ]
 
 
+class FakeAgentSuccessEvent(AbstractAgentEvent):
+    success: bool
+
+
+FILTER_EVENTS: List[AbstractAgentEvent] = [
+    FakeAgentSuccessEvent(source=uuid.uuid4(), timestamp=1, tags={"foo"}, success=True),
+    FakeAgentSuccessEvent(source=uuid.uuid4(), timestamp=2, tags={"bar"}, success=False),
+    FakeAgentSuccessEvent(source=uuid.uuid4(), timestamp=3, tags={"foo", "bar"}, success=True),
+    FakeAgentEvent(source=uuid.uuid4(), timestamp=4, tags={"foo"}),
+    PasswordRestorationEvent(
+        source=uuid.uuid4(),
+        timestamp=5,
+        tags={"bar"},
+        target=IPv4Address("10.0.0.1"),
+        success=False,
+    ),
+]
+
+
 @pytest.fixture
 def event_serializer_registry() -> AgentEventSerializerRegistry:
     registry = AgentEventSerializerRegistry()
     registry[FakeAgentEvent] = PydanticAgentEventSerializer(FakeAgentEvent)
     registry[FakeAgentItemEvent] = PydanticAgentEventSerializer(FakeAgentItemEvent)
+    registry[FakeAgentSuccessEvent] = PydanticAgentEventSerializer(FakeAgentSuccessEvent)
+    registry[PasswordRestorationEvent] = PydanticAgentEventSerializer(PasswordRestorationEvent)
     return registry
 
 
@@ -197,6 +219,144 @@ def test_mongo_agent_event_repository__get_events_by_tag_raises(
         error_raising_mongo_repository.get_events_by_tag("bar")
 
 
+@pytest.fixture
+def filter_mongo_repository(
+    event_serializer_registry, repository_encryptor
+) -> IAgentEventRepository:
+    repository = MongoAgentEventRepository(
+        mongomock.MongoClient(), event_serializer_registry, repository_encryptor
+    )
+    for event in reversed(FILTER_EVENTS):
+        repository.save_event(event)
+
+    return repository
+
+
+@pytest.mark.parametrize(
+    "filters, expected_indexes",
+    [
+        ({}, [0, 1, 2, 3, 4]),
+        ({"event_type": FakeAgentSuccessEvent}, [0, 1, 2]),
+        ({"event_type": FakeAgentItemEvent}, []),
+        ({"tag": "foo"}, [0, 2, 3]),
+        ({"tag": "unknown"}, []),
+        ({"success": True}, [0, 2]),
+        ({"success": False}, [1, 4]),
+        ({"tag": "bar", "success": False}, [1, 4]),
+        ({"event_type": PasswordRestorationEvent, "success": True}, []),
+        ({"timestamp_gt": 2}, [2, 3, 4]),
+        ({"timestamp_lt": 2}, [0]),
+        ({"timestamp_gt": 1, "timestamp_lt": 4}, [1, 2]),
+        ({"event_type": FakeAgentSuccessEvent, "tag": "foo", "success": True}, [0, 2]),
+        ({"tag": "bar", "success": True, "timestamp_gt": 2}, [2]),
+    ],
+)
+def test_mongo_agent_event_repository__get_filtered_events(
+    filter_mongo_repository: IAgentEventRepository, filters, expected_indexes
+):
+    events = filter_mongo_repository.get_filtered_events(**filters)
+
+    assert events == [FILTER_EVENTS[i] for i in expected_indexes]
+
+
+@pytest.mark.parametrize(
+    "filters, expected_indexes",
+    [
+        ({"limit": 2}, [0, 1]),
+        ({"timestamp_gt": 3, "limit": 1}, [3]),
+        ({"success": False, "limit": 1}, [1]),
+        ({"success": True, "limit": 10}, [0, 2]),
+    ],
+)
+def test_mongo_agent_event_repository__get_filtered_events_page(
+    filter_mongo_repository: IAgentEventRepository, filters, expected_indexes
+):
+    events, _ = filter_mongo_repository.get_filtered_events_page(**filters)
+
+    assert events == [FILTER_EVENTS[i] for i in expected_indexes]
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [{}, {"tag": "foo"}, {"success": True}, {"success": False}, {"timestamp_gt": 1}],
+)
+@pytest.mark.parametrize("limit", [1, 2, 3])
+def test_mongo_agent_event_repository__get_filtered_events_page__same_timestamp(
+    event_serializer_registry, repository_encryptor, filters, limit
+):
+    repository = MongoAgentEventRepository(
+        mongomock.MongoClient(), event_serializer_registry, repository_encryptor
+    )
+    # Agents often give several events the same timestamp, so pages can end in the middle of a
+    # group of events with the same timestamp
+    events = [
+        FakeAgentSuccessEvent(
+            source=uuid.uuid4(), timestamp=timestamp, tags={"foo"}, success=bool(i % 2)
+        )
+        for i, timestamp in enumerate([1, 2, 2, 2, 2, 2, 3, 3])
+    ]
+    for event in events:
+        repository.save_event(event)
+
+    paged_events: List[AbstractAgentEvent] = []
+    page, cursor = repository.get_filtered_events_page(**filters, limit=limit)
+    while page:
+        paged_events.extend(page)
+        page, cursor = repository.get_filtered_events_page(**filters, after=cursor, limit=limit)
+
+    assert paged_events == repository.get_filtered_events(**filters)
+
+
+def test_mongo_agent_event_repository__get_filtered_events_page__cursor(
+    filter_mongo_repository: IAgentEventRepository,
+):
+    _, cursor = filter_mongo_repository.get_filtered_events_page(limit=2)
+
+    events, next_cursor = filter_mongo_repository.get_filtered_events_page(after=cursor)
+
+    assert events == FILTER_EVENTS[2:]
+    assert filter_mongo_repository.get_filtered_events_page(after=next_cursor) == ([], None)
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    ["", "1", "1:2:3", "x:5f9b1c2e8d1b2c3d4e5f6a7b", "1:xyz", "inf:5f9b1c2e8d1b2c3d4e5f6a7b"],
+)
+def test_mongo_agent_event_repository__get_filtered_events_page__invalid_cursor(
+    filter_mongo_repository: IAgentEventRepository, cursor
+):
+    with pytest.raises(ValueError):
+        filter_mongo_repository.get_filtered_events_page(after=cursor)
+
+
+def test_mongo_agent_event_repository__get_filtered_events_raises(
+    error_raising_mongo_repository: IAgentEventRepository,
+):
+    with pytest.raises(RetrievalError):
+        error_raising_mongo_repository.get_filtered_events(tag="bar")
+
+
+def test_mongo_agent_event_repository__get_latest_event(
+    filter_mongo_repository: IAgentEventRepository,
+):
+    assert filter_mongo_repository.get_latest_event() == FILTER_EVENTS[-1]
+
+
+def test_mongo_agent_event_repository__get_latest_event_empty(
+    mongo_repository: IAgentEventRepository,
+):
+    mongo_repository.reset()
+
+    assert mongo_repository.get_latest_event() is None
+
+
+def test_mongo_agent_event_repository__get_latest_event_raises(
+    error_raising_mongo_repository: IAgentEventRepository,
+):
+    with pytest.raises(RetrievalError):
+        error_raising_mongo_repository.get_latest_event()
+
+
 def test_mongo_agent_event_repository__get_events_by_source(
     mongo_repository: IAgentEventRepository,
 ):
@@ -1,4 +1,3 @@
-import uuid
 from http import HTTPStatus
 from ipaddress import IPv4Address
 from unittest.mock import MagicMock
@@ -10,12 +9,14 @@ from tests.common import StubDIContainer
 
 from common.agent_event_serializers import (
     AgentEventSerializerRegistry,
+    IAgentEventSerializer,
     PydanticAgentEventSerializer,
 )
 from common.agent_events import AbstractAgentEvent, AgentEventRegistry, AgentEventTag
 from common.event_queue import IAgentEventQueue
 from monkey_island.cc.repositories import IAgentEventRepository
 from monkey_island.cc.resources import AgentEvents
+from monkey_island.cc.resources.agent_events import MAX_EVENTS_LIMIT, NEXT_CURSOR_HEADER
 
 AGENT_EVENTS_URL = AgentEvents.urls[0]
 
@@ -83,29 +84,10 @@ EXPECTED_EVENT_3 = DifferentAgentEvent(
     tags=frozenset({"some-event3"}),
 )
 
-TIMESTAMP_EVENT_1 = SomeAgentEvent(source=uuid.uuid4(), timestamp=1)
-
-TIMESTAMP_EVENT_2 = SomeAgentEvent(source=uuid.uuid4(), timestamp=2)
-
-TIMESTAMP_EVENT_3 = SomeAgentEvent(source=uuid.uuid4(), timestamp=3)
-
-TIMESTAMP_EVENT_4 = SomeAgentEvent(source=uuid.uuid4(), timestamp=4)
-
-TIMESTAMP_EVENT_5 = SomeAgentEvent(source=uuid.uuid4(), timestamp=5)
-
-
 LIST_EVENTS = [SERIALIZED_EVENT_1, SERIALIZED_EVENT_2, SERIALIZED_EVENT_3]
 
 EXPECTED_EVENTS = [EXPECTED_EVENT_1, EXPECTED_EVENT_2, EXPECTED_EVENT_3]
 
-TIMESTAMP_EVENTS = [
-    TIMESTAMP_EVENT_1,
-    TIMESTAMP_EVENT_2,
-    TIMESTAMP_EVENT_3,
-    TIMESTAMP_EVENT_4,
-    TIMESTAMP_EVENT_5,
-]
-
 
 class PassFailAgentEvent_type1(AbstractAgentEvent):
     success: bool
@@ -190,7 +172,9 @@ def error_raising_event_serializer_registry():
 @pytest.fixture
 def agent_event_repository():
     agent_event_repository = MagicMock(spec=IAgentEventRepository)
-    agent_event_repository.get_events = MagicMock(return_value=EXPECTED_EVENTS)
+    agent_event_repository.get_filtered_events_page = MagicMock(
+        return_value=(EXPECTED_EVENTS, None)
+    )
 
     return agent_event_repository
 
@@ -257,10 +241,7 @@ def test_agent_events_endpoint__post(flask_client, mock_agent_event_queue):
     resp_post = flask_client.post(AGENT_EVENTS_URL, json=LIST_EVENTS)
 
     assert resp_post.status_code == HTTPStatus.NO_CONTENT
-    assert mock_agent_event_queue.publish.call_count == len(EXPECTED_EVENTS)
-
-    for call_args in mock_agent_event_queue.publish.call_args_list:
-        assert call_args[0][0] in EXPECTED_EVENTS
+    mock_agent_event_queue.publish_many.assert_called_once_with(EXPECTED_EVENTS)
 
 
 def test_agent_events_endpoint__get(flask_client):
@@ -271,123 +252,258 @@ def test_agent_events_endpoint__get(flask_client):
     assert actual_serialized_events == LIST_EVENTS
 
 
+def test_agent_events_endpoint__get_many(flask_client, agent_event_repository):
+    events = [SomeAgentEvent(source=EXPECTED_EVENT_1.source, timestamp=i) for i in range(250)]
+    agent_event_repository.get_filtered_events_page = MagicMock(return_value=(events, None))
+
+    resp_get = flask_client.get(AGENT_EVENTS_URL)
+
+    assert resp_get.status_code == HTTPStatus.OK
+    assert [event["timestamp"] for event in resp_get.json] == list(range(250))
+
+
+def test_agent_events_endpoint__get_none(flask_client, agent_event_repository):
+    agent_event_repository.get_filtered_events_page = MagicMock(return_value=([], None))
+
+    resp_get = flask_client.get(AGENT_EVENTS_URL)
+
+    assert resp_get.status_code == HTTPStatus.OK
+    assert resp_get.json == []
+
+
 def test_agent_events_endpoint__get_error(error_raising_flask_client):
     resp_get = error_raising_flask_client.get(AGENT_EVENTS_URL)
 
     assert resp_get.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
 
 
-def test_get_filter__event_type(flask_client, agent_event_repository):
-    all_events = [PFAE1_1, PFAE1_2, PFAE2_1]
-    expected_events_by_type = [PFAE1_1, PFAE1_2]
+def test_agent_events_endpoint__get_serialization_error(flask_client, event_serializer_registry):
+    error_raising_event_serializer = MagicMock(spec=IAgentEventSerializer)
+    error_raising_event_serializer.serialize = MagicMock(side_effect=ValueError("invalid event"))
+    event_serializer_registry[SomeAgentEvent] = error_raising_event_serializer
+
+    resp_get = flask_client.get(AGENT_EVENTS_URL)
+
+    assert resp_get.status_code == HTTPStatus.INTERNAL_SERVER_ERROR
+    assert resp_get.json == {"error": "invalid event"}
 
-    agent_event_repository.get_events = MagicMock(return_value=all_events)
-    agent_event_repository.get_events_by_type = MagicMock(return_value=expected_events_by_type)
+
+def test_get_filter__no_filters(flask_client, agent_event_repository):
+    resp_get = flask_client.get(AGENT_EVENTS_URL)
+    assert resp_get.status_code == HTTPStatus.OK
+
+    agent_event_repository.get_filtered_events_page.assert_called_once_with(
+        event_type=None,
+        tag=None,
+        success=None,
+        timestamp_gt=None,
+        timestamp_lt=None,
+        after=None,
+        limit=None,
+    )
+
+
+def test_get_filter__event_type(flask_client, agent_event_repository):
+    agent_event_repository.get_filtered_events_page = MagicMock(
+        return_value=([PFAE1_1, PFAE1_2], None)
+    )
 
     resp_get = flask_client.get(AGENT_EVENTS_URL + "?type=PassFailAgentEvent_type1")
     assert resp_get.status_code == HTTPStatus.OK
 
     assert resp_get.json == [SERIALIZED_PFAE1_1, SERIALIZED_PFAE1_2]
+    agent_event_repository.get_filtered_events_page.assert_called_once_with(
+        event_type=PassFailAgentEvent_type1,
+        tag=None,
+        success=None,
+        timestamp_gt=None,
+        timestamp_lt=None,
+        after=None,
+        limit=None,
+    )
 
 
 def test_get_filter__event_tag(flask_client, agent_event_repository):
-    all_events = [PFAE1_1, PFAE1_2, PFAE2_1]
-    expected_events_by_tag = [PFAE1_1, PFAE2_1]
-
-    agent_event_repository.get_events = MagicMock(return_value=all_events)
-    agent_event_repository.get_events_by_tag = MagicMock(return_value=expected_events_by_tag)
+    agent_event_repository.get_filtered_events_page = MagicMock(
+        return_value=([PFAE1_1, PFAE2_1], None)
+    )
 
     resp_get = flask_client.get(AGENT_EVENTS_URL + "?tag=_1")
     assert resp_get.status_code == HTTPStatus.OK
 
     assert resp_get.json == [SERIALIZED_PFAE1_1, SERIALIZED_PFAE2_1]
+    agent_event_repository.get_filtered_events_page.assert_called_once_with(
+        event_type=None,
+        tag="_1",
+        success=None,
+        timestamp_gt=None,
+        timestamp_lt=None,
+        after=None,
+        limit=None,
+    )
 
 
-def test_get_filter__success_true(flask_client, agent_event_repository):
-    agent_event_repository.get_events = MagicMock(return_value=[PFAE1_1, PFAE1_2, PFAE2_1])
-
-    resp_get = flask_client.get(AGENT_EVENTS_URL + "?success=true")
+@pytest.mark.parametrize("success_arg, success", [("true", True), ("false", False)])
+def test_get_filter__success(flask_client, agent_event_repository, success_arg, success):
+    resp_get = flask_client.get(AGENT_EVENTS_URL + f"?success={success_arg}")
     assert resp_get.status_code == HTTPStatus.OK
 
-    assert resp_get.json == [SERIALIZED_PFAE1_2, SERIALIZED_PFAE2_1]
+    agent_event_repository.get_filtered_events_page.assert_called_once_with(
+        event_type=None,
+        tag=None,
+        success=success,
+        timestamp_gt=None,
+        timestamp_lt=None,
+        after=None,
+        limit=None,
+    )
 
 
-def test_get_filter__success_false(flask_client, agent_event_repository):
-    agent_event_repository.get_events = MagicMock(return_value=[PFAE1_1, PFAE1_2, PFAE2_1])
+@pytest.mark.parametrize("query_param", [-1, 0, 1.9999, 2, 3, 1.5e9, 1697355000.123456])
+def test_get_filter__event_gt_timestamp(flask_client, agent_event_repository, query_param):
+    resp_get = flask_client.get(AGENT_EVENTS_URL + f"?timestamp=gt:{query_param}")
+    assert resp_get.status_code == HTTPStatus.OK
+
+    agent_event_repository.get_filtered_events_page.assert_called_once_with(
+        event_type=None,
+        tag=None,
+        success=None,
+        timestamp_gt=query_param,
+        timestamp_lt=None,
+        after=None,
+        limit=None,
+    )
+
 
-    resp_get = flask_client.get(AGENT_EVENTS_URL + "?success=false")
+@pytest.mark.parametrize(
+    "timestamp, expected_timestamp", [(".5", 0.5), ("+1", 1), ("1.", 1), ("-2.5e1", -25)]
+)
+def test_get_filter__timestamp_number_formats(
+    flask_client, agent_event_repository, timestamp, expected_timestamp
+):
+    resp_get = flask_client.get(AGENT_EVENTS_URL, query_string={"timestamp": f"gt:{timestamp}"})
     assert resp_get.status_code == HTTPStatus.OK
 
-    assert resp_get.json == [SERIALIZED_PFAE1_1]
+    agent_event_repository.get_filtered_events_page.assert_called_once_with(
+        event_type=None,
+        tag=None,
+        success=None,
+        timestamp_gt=expected_timestamp,
+        timestamp_lt=None,
+        after=None,
+        limit=None,
+    )
 
 
-def test_get_filter__event_missing_success(flask_client, agent_event_repository):
-    agent_event_repository.get_events = MagicMock(
-        return_value=[PFAE1_1, PFAE1_2, PFAE2_1, EXPECTED_EVENT_1, EXPECTED_EVENT_2]
+@pytest.mark.parametrize("query_param", [-1, 0, 1.9999, 2, 3])
+def test_get_filter__event_lt_timestamp(flask_client, agent_event_repository, query_param):
+    resp_get = flask_client.get(AGENT_EVENTS_URL + f"?timestamp=lt:{query_param}")
+    assert resp_get.status_code == HTTPStatus.OK
+
+    agent_event_repository.get_filtered_events_page.assert_called_once_with(
+        event_type=None,
+        tag=None,
+        success=None,
+        timestamp_gt=None,
+        timestamp_lt=query_param,
+        after=None,
+        limit=None,
     )
 
-    resp_get = flask_client.get(AGENT_EVENTS_URL + "?success=false")
+
+def test_get_filter__type_tag_and_success(flask_client, agent_event_repository):
+    agent_event_repository.get_filtered_events_page = MagicMock(return_value=([PFAE1_1], None))
+
+    resp_get = flask_client.get(
+        AGENT_EVENTS_URL + "?type=PassFailAgentEvent_type1&tag=_1&success=false"
+    )
     assert resp_get.status_code == HTTPStatus.OK
 
     assert resp_get.json == [SERIALIZED_PFAE1_1]
+    agent_event_repository.get_filtered_events_page.assert_called_once_with(
+        event_type=PassFailAgentEvent_type1,
+        tag="_1",
+        success=False,
+        timestamp_gt=None,
+        timestamp_lt=None,
+        after=None,
+        limit=None,
+    )
 
 
-@pytest.mark.parametrize(
-    "query_param, index", [(-1, 0), (1.9999, 1), (2, 2), (2.1, 2), (2.99999, 2), (3, 3)]
-)
-def test_get_filter__event_gt_timestamp(flask_client, agent_event_repository, query_param, index):
-    agent_event_repository.get_events = MagicMock(return_value=TIMESTAMP_EVENTS)
+def test_get_filter__limit(flask_client, agent_event_repository):
+    resp_get = flask_client.get(AGENT_EVENTS_URL + "?timestamp=gt:2&limit=10")
+    assert resp_get.status_code == HTTPStatus.OK
 
-    resp_get = flask_client.get(AGENT_EVENTS_URL + f"?timestamp=gt:{query_param}")
+    agent_event_repository.get_filtered_events_page.assert_called_once_with(
+        event_type=None,
+        tag=None,
+        success=None,
+        timestamp_gt=2,
+        timestamp_lt=None,
+        after=None,
+        limit=10,
+    )
+
+
+def test_get_filter__max_limit(flask_client, agent_event_repository):
+    resp_get = flask_client.get(AGENT_EVENTS_URL + f"?limit={MAX_EVENTS_LIMIT}")
     assert resp_get.status_code == HTTPStatus.OK
 
-    returned_events = resp_get.json
-    assert [event["timestamp"] for event in returned_events] == [
-        event.timestamp for event in TIMESTAMP_EVENTS[index:]
-    ]
+    agent_event_repository.get_filtered_events_page.assert_called_once_with(
+        event_type=None,
+        tag=None,
+        success=None,
+        timestamp_gt=None,
+        timestamp_lt=None,
+        after=None,
+        limit=MAX_EVENTS_LIMIT,
+    )
 
 
-@pytest.mark.parametrize(
-    "query_param, index", [(-1, 0), (1.9999, 1), (2, 1), (2.1, 2), (2.99999, 2), (4, 3)]
-)
-def test_get_filter__event_lt_timestamp(flask_client, agent_event_repository, query_param, index):
-    agent_event_repository.get_events = MagicMock(return_value=TIMESTAMP_EVENTS)
+def test_get_filter__after(flask_client, agent_event_repository):
+    agent_event_repository.get_filtered_events_page = MagicMock(
+        return_value=([PFAE1_1], "next-cursor")
+    )
 
-    resp_get = flask_client.get(AGENT_EVENTS_URL + f"?timestamp=lt:{query_param}")
+    resp_get = flask_client.get(AGENT_EVENTS_URL + "?after=cursor&limit=1")
     assert resp_get.status_code == HTTPStatus.OK
 
-    returned_events = resp_get.json
-    assert [event["timestamp"] for event in returned_events] == [
-        event.timestamp for event in TIMESTAMP_EVENTS[:index]
-    ]
-
+    assert resp_get.json == [SERIALIZED_PFAE1_1]
+    assert resp_get.headers[NEXT_CURSOR_HEADER] == "next-cursor"
+    agent_event_repository.get_filtered_events_page.assert_called_once_with(
+        event_type=None,
+        tag=None,
+        success=None,
+        timestamp_gt=None,
+        timestamp_lt=None,
+        after="cursor",
+        limit=1,
+    )
 
-def test_get_filter__type_and_success(flask_client, agent_event_repository):
-    all_events = [PFAE1_1, PFAE1_2, PFAE2_1]
-    expected_events_by_type = [PFAE1_1, PFAE1_2]
 
-    agent_event_repository.get_events = MagicMock(return_value=all_events)
-    agent_event_repository.get_events_by_type = MagicMock(return_value=expected_events_by_type)
+def test_get__no_next_cursor(flask_client, agent_event_repository):
+    agent_event_repository.get_filtered_events_page = MagicMock(return_value=([], None))
 
-    resp_get = flask_client.get(AGENT_EVENTS_URL + "?type=PassFailAgentEvent_type1&success=true")
+    resp_get = flask_client.get(AGENT_EVENTS_URL + "?after=cursor")
     assert resp_get.status_code == HTTPStatus.OK
 
-    assert resp_get.json == [SERIALIZED_PFAE1_2]
+    assert NEXT_CURSOR_HEADER not in resp_get.headers
 
 
-def test_get_filter__type_and_tag(flask_client, agent_event_repository):
-    all_events = [PFAE1_1, PFAE1_2, PFAE2_1]
-    expected_events_by_type = [PFAE1_1, PFAE1_2]
-    expected_events_by_tag = [PFAE1_1, PFAE2_1]
+def test_get_filter__invalid_after(flask_client, agent_event_repository):
+    agent_event_repository.get_filtered_events_page = MagicMock(side_effect=ValueError)
 
-    agent_event_repository.get_events = MagicMock(return_value=all_events)
-    agent_event_repository.get_events_by_type = MagicMock(return_value=expected_events_by_type)
-    agent_event_repository.get_events_by_tag = MagicMock(return_value=expected_events_by_tag)
+    resp_get = flask_client.get(AGENT_EVENTS_URL + "?after=invalid")
+    assert resp_get.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
 
-    resp_get = flask_client.get(AGENT_EVENTS_URL + "?type=PassFailAgentEvent_type1&tag=_1")
-    assert resp_get.status_code == HTTPStatus.OK
 
-    assert resp_get.json == [SERIALIZED_PFAE1_1]
+@pytest.mark.parametrize(
+    "limit_arg", ["0", "-1", "1.5", "ten", "", "10001", "100000000000000000000"]
+)
+def test_get_filter__invalid_limit(flask_client, limit_arg):
+    resp_get = flask_client.get(AGENT_EVENTS_URL + f"?limit={limit_arg}")
+    assert resp_get.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
 
 
 def test_get_filter__unknown_type(flask_client):
@@ -395,7 +511,9 @@ def test_get_filter__unknown_type(flask_client):
     assert resp_get.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
 
 
-def test_get_filter__unknown_tag(flask_client):
+def test_get_filter__unknown_tag(flask_client, agent_event_repository):
+    agent_event_repository.get_filtered_events_page = MagicMock(return_value=([], None))
+
     resp_get = flask_client.get(AGENT_EVENTS_URL + "?tag=unknown-tag")
     assert resp_get.status_code == HTTPStatus.OK
     assert resp_get.json == []
@@ -406,7 +524,27 @@ def test_get_filter__invalid_success(flask_client):
     assert resp_get.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
 
 
-@pytest.mark.parametrize("timestamp_arg", ["never", "gt:xyz", "at:123", ":::", "a:b:c", "", "   "])
+@pytest.mark.parametrize(
+    "timestamp_arg",
+    [
+        "never",
+        "gt:xyz",
+        "at:123",
+        ":::",
+        "a:b:c",
+        "",
+        "   ",
+        "gt:",
+        "lt:1:2",
+        "gt:nan",
+        "gt: 1",
+        "gt:1%0A",
+        "gt:.",
+        "gt:%2B",
+        "gt:1e999",
+        "lt:-1e400",
+    ],
+)
 def test_get_filter__invalid_timestamp(timestamp_arg, flask_client):
     resp_get = flask_client.get(AGENT_EVENTS_URL + f"?timestamp={timestamp_arg}")
     assert resp_get.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
@@ -51,6 +51,33 @@ def test_agent_configuration_endpoint(flask_client):
     assert AgentConfiguration(**json.loads(resp.data)) == AgentConfiguration(**AGENT_CONFIGURATION)
 
 
+def test_agent_configuration_endpoint__not_modified(flask_client):
+    resp = flask_client.get(AGENT_CONFIGURATION_URL)
+    etag = resp.headers["ETag"]
+
+    resp = flask_client.get(AGENT_CONFIGURATION_URL, headers={"If-None-Match": etag})
+
+    assert resp.status_code == HTTPStatus.NOT_MODIFIED
+    assert resp.headers["ETag"] == etag
+    assert resp.data == b""
+
+
+def test_agent_configuration_endpoint__etag_changes_on_update(flask_client):
+    resp = flask_client.get(AGENT_CONFIGURATION_URL)
+    etag = resp.headers["ETag"]
+
+    flask_client.put(
+        AGENT_CONFIGURATION_URL,
+        json=AgentConfiguration(**AGENT_CONFIGURATION).dict(simplify=True),
+        follow_redirects=True,
+    )
+    resp = flask_client.get(AGENT_CONFIGURATION_URL, headers={"If-None-Match": etag})
+
+    assert resp.status_code == HTTPStatus.OK
+    assert resp.headers["ETag"] != etag
+    assert AgentConfiguration(**json.loads(resp.data)) == AgentConfiguration(**AGENT_CONFIGURATION)
+
+
 @pytest.mark.parametrize(
     "error, expected_status",
     [
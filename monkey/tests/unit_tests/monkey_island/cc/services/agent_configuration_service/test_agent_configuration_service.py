@@ -0,0 +1,150 @@
+from unittest.mock import MagicMock
+
+import pytest
+from monkeytypes import AgentPluginType, OperatingSystem
+from tests.common.fake_manifests import FAKE_MANIFEST_OBJECT, FAKE_NAME
+from tests.monkey_island import InMemoryAgentConfigurationRepository, InMemoryAgentPluginRepository
+from tests.unit_tests.monkey_island.cc.fake_agent_plugin_data import FAKE_AGENT_PLUGIN_1
+
+from common.agent_configuration import DEFAULT_AGENT_CONFIGURATION, AgentConfiguration
+from monkey_island.cc.repositories import RetrievalError
+from monkey_island.cc.services.agent_configuration_service.agent_configuration_schema_compiler import (  # noqa: E501
+    AgentConfigurationSchemaCompiler,
+)
+from monkey_island.cc.services.agent_configuration_service.agent_configuration_service import (  # noqa: E501
+    AgentConfigurationService,
+)
+from monkey_island.cc.services.agent_configuration_service.agent_configuration_validation_decorator import (  # noqa: E501
+    AgentConfigurationValidationDecorator,
+)
+from monkey_island.cc.services.agent_plugin_service import IAgentPluginService
+from monkey_island.cc.services.agent_plugin_service.agent_plugin_service import AgentPluginService
+
+# A plugin without a description can't be compiled into a valid schema
+FAKE_AGENT_PLUGIN = FAKE_AGENT_PLUGIN_1.copy(
+    update={"plugin_manifest": FAKE_MANIFEST_OBJECT.copy(update={"description": "Fake plugin"})}
+)
+
+
+@pytest.fixture
+def agent_plugin_service() -> IAgentPluginService:
+    agent_plugin_repository = InMemoryAgentPluginRepository()
+    agent_plugin_repository.store_agent_plugin(OperatingSystem.LINUX, FAKE_AGENT_PLUGIN)
+
+    return AgentPluginService(agent_plugin_repository, MagicMock())
+
+
+@pytest.fixture
+def schema_compiler(agent_plugin_service) -> AgentConfigurationSchemaCompiler:
+    return AgentConfigurationSchemaCompiler(agent_plugin_service)
+
+
+@pytest.fixture
+def agent_configuration_repository(schema_compiler) -> MagicMock:
+    return MagicMock(
+        wraps=AgentConfigurationValidationDecorator(
+            InMemoryAgentConfigurationRepository(), schema_compiler
+        )
+    )
+
+
+@pytest.fixture
+def agent_configuration_service(
+    agent_configuration_repository, schema_compiler
+) -> AgentConfigurationService:
+    return AgentConfigurationService(agent_configuration_repository, schema_compiler)
+
+
+@pytest.fixture
+def configuration_with_plugin() -> AgentConfiguration:
+    configuration_dict = DEFAULT_AGENT_CONFIGURATION.dict(simplify=True)
+    configuration_dict["propagation"]["exploitation"]["exploiters"] = {
+        FAKE_NAME: {"exploitation_success_rate": 50, "propagation_success_rate": 50}
+    }
+
+    return AgentConfiguration(**configuration_dict)
+
+
+def test_get_configuration__reads_repository_once(
+    agent_configuration_service, agent_configuration_repository
+):
+    configuration_1 = agent_configuration_service.get_configuration()
+    configuration_2 = agent_configuration_service.get_configuration()
+
+    assert configuration_1 == configuration_2
+    assert agent_configuration_repository.get_configuration.call_count == 1
+
+
+def test_get_configuration__returns_copy(agent_configuration_service):
+    configuration = agent_configuration_service.get_configuration()
+    configuration.keep_tunnel_open_time = configuration.keep_tunnel_open_time + 1
+
+    assert agent_configuration_service.get_configuration() != configuration
+
+
+def test_update_configuration__invalidates_cache(agent_configuration_service):
+    agent_configuration_service.get_configuration()
+    new_configuration = DEFAULT_AGENT_CONFIGURATION.copy(update={"keep_tunnel_open_time": 99})
+
+    agent_configuration_service.update_configuration(new_configuration)
+
+    assert agent_configuration_service.get_configuration() == new_configuration
+
+
+def test_reset_to_default__invalidates_cache(
+    agent_configuration_service, agent_configuration_repository
+):
+    agent_configuration_service.get_configuration()
+
+    agent_configuration_service.reset_to_default()
+    agent_configuration_service.get_configuration()
+
+    assert agent_configuration_repository.get_configuration.call_count == 2
+
+
+def test_get_versioned_configuration__compiles_schema_once(
+    agent_configuration_repository, schema_compiler
+):
+    schema_compiler = MagicMock(wraps=schema_compiler)
+    agent_configuration_service = AgentConfigurationService(
+        agent_configuration_repository, schema_compiler
+    )
+    agent_configuration_service.get_versioned_configuration()
+    schema_compiler.get_schema.reset_mock()
+
+    agent_configuration_service.get_versioned_configuration()
+
+    assert schema_compiler.get_schema.call_count == 1
+
+
+def test_get_versioned_configuration__version_changes_on_update(agent_configuration_service):
+    version_1, _ = agent_configuration_service.get_versioned_configuration()
+    new_configuration = DEFAULT_AGENT_CONFIGURATION.copy(update={"keep_tunnel_open_time": 99})
+
+    agent_configuration_service.update_configuration(new_configuration)
+    version_2, configuration = agent_configuration_service.get_versioned_configuration()
+
+    assert version_2 != version_1
+    assert configuration == new_configuration
+
+
+def test_get_versioned_configuration__version_changes_when_plugins_change(
+    agent_configuration_service, agent_plugin_service
+):
+    version_1, _ = agent_configuration_service.get_versioned_configuration()
+
+    agent_plugin_service.uninstall_plugin(AgentPluginType.EXPLOITER, FAKE_NAME)
+
+    assert agent_configuration_service.get_versioned_configuration()[0] != version_1
+
+
+def test_get_configuration__plugin_uninstalled(
+    agent_configuration_service, agent_plugin_service, configuration_with_plugin
+):
+    agent_configuration_service.update_configuration(configuration_with_plugin)
+    assert agent_configuration_service.get_configuration() == configuration_with_plugin
+
+    agent_plugin_service.uninstall_plugin(AgentPluginType.EXPLOITER, FAKE_NAME)
+
+    with pytest.raises(RetrievalError):
+        agent_configuration_service.get_configuration()
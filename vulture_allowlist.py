@@ -130,8 +130,10 @@ Machine._socketaddress_from_string
 Machine.island
 
 # We anticipate using these in the future
+IAgentEventRepository.get_events
 IAgentEventRepository.get_events_by_tag
 IAgentEventRepository.get_events_by_source
+MongoAgentEventRepository.get_events
 MongoAgentEventRepository.get_events_by_tag
 MongoAgentEventRepository.get_events_by_source
 